@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Merge Ollama cloud model configuration into OpenClaw config.
+
+Usage:
+  ./merge-config.py [OPTIONS]
+
+Options:
+  --source PATH       Path to ollama cloud config, or - for stdin (default: ./openclaw-ollama-cloud.json)
+  --target PATH       Path to openclaw.json (default: ~/.openclaw/openclaw.json)
+  --dry-run           Show what would change without applying
+  --backup            Create .bak backup of target before modifying
+  --only-models       Only merge models.providers.ollama section
+  --only-agents       Only merge agents.defaults.model section
+  -h, --help          Show this help message
+
+Examples:
+  ./merge-config.py                           # Full merge with defaults
+  ./merge-config.py --dry-run                 # Preview changes
+  ./merge-config.py --backup                  # Merge with backup
+  ./merge-config.py --only-models             # Just update provider models
+  ./merge-config.py --source - < cloud.json   # Read source config from stdin
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import shutil
+import stat
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib parser
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional: partial source reads fall back to a full parse
+    ijson = None
+
+
+# (path, keys) for each mergeable section; source and target paths are the
+# same, and the keys are split once here rather than on every lookup
+_MODELS = ("models.providers.ollama", ("models", "providers", "ollama"))
+_AGENT_MODEL = ("agents.defaults.model", ("agents", "defaults", "model"))
+_AGENT_MODELS = ("agents.defaults.models", ("agents", "defaults", "models"))
+
+SECTIONS_ALL = (_MODELS, _AGENT_MODEL, _AGENT_MODELS)
+SECTIONS_ONLY_MODELS = (_MODELS,)
+SECTIONS_ONLY_AGENTS = (_AGENT_MODEL, _AGENT_MODELS)
+
+# --source value meaning "read the source config from stdin"
+STDIN = Path("-")
+
+# Per-section results from merge_sections
+MISSING = "missing"
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+
+_MERGE_COMPLETE = (
+    "",
+    "✅ Merge complete!",
+    "",
+    "📝 Next steps:",
+    "   1. Review the merged config: openclaw config.get | jq '.models.providers.ollama'",
+    "   2. Restart OpenClaw to pick up changes: openclaw gateway restart",
+    "   3. Run `./setup-ollama.sh` to pull/configure models",
+)
+
+
+def deep_merge(target: Any, source: Any) -> Any:
+    """Deep merge source into target."""
+    if not (isinstance(target, dict) and isinstance(source, dict)):
+        return source
+
+    # Walk nested dicts with an explicit stack instead of recursing per level
+    stack = [(target, source)]
+    while stack:
+        tgt, src = stack.pop()
+        for key, src_val in src.items():
+            tgt_val = tgt.get(key)
+            if isinstance(tgt_val, dict) and isinstance(src_val, dict):
+                stack.append((tgt_val, src_val))
+            else:
+                # Lists and scalars are replaced entirely (don't append)
+                tgt[key] = src_val
+    return target
+
+
+@lru_cache(maxsize=128)
+def _split_path(path: str) -> tuple:
+    """Split a dot path into keys.
+
+    Cached because the same few section paths recur; bounded since
+    get_nested/set_nested accept arbitrary caller paths.
+    """
+    return tuple(path.split("."))
+
+
+def _get_keys(obj: Any, keys: tuple) -> Any:
+    """Get nested value by pre-split keys."""
+    for key in keys:
+        if not isinstance(obj, dict):
+            return None
+        obj = obj.get(key)
+    return obj
+
+
+def _get_keys_multi(obj: Any, keys_list: tuple) -> tuple:
+    """Get nested values for several pre-split key tuples.
+
+    Intermediate nodes are remembered by prefix, so paths sharing a
+    prefix (e.g. agents.defaults.*) walk it only once.
+    """
+    nodes = {(): obj}
+    results = []
+    for keys in keys_list:
+        depth = len(keys)
+        while keys[:depth] not in nodes:
+            depth -= 1
+        node = nodes[keys[:depth]]
+        for i in range(depth, len(keys)):
+            node = node.get(keys[i]) if isinstance(node, dict) else None
+            nodes[keys[:i + 1]] = node
+        results.append(node)
+    return tuple(results)
+
+
+def _set_keys(obj: dict, keys: tuple, value: Any) -> None:
+    """Set nested value by pre-split keys, creating parent dicts as needed."""
+    for key in keys[:-1]:
+        child = obj.get(key)
+        if not isinstance(child, dict):
+            child = obj[key] = {}
+        obj = child
+    obj[keys[-1]] = value
+
+
+def get_nested(obj: dict, path: str) -> Any:
+    """Get nested value by dot path."""
+    return _get_keys(obj, _split_path(path))
+
+
+def get_nested_multi(obj: dict, paths: tuple) -> tuple:
+    """Get nested values for several dot paths, in order."""
+    return _get_keys_multi(obj, tuple(_split_path(path) for path in paths))
+
+
+def set_nested(obj: dict, path: str, value: Any) -> None:
+    """Set nested value by dot path."""
+    _set_keys(obj, _split_path(path), value)
+
+
+def select_sections(only_models: bool = False, only_agents: bool = False) -> tuple:
+    """Return the section table for the --only-* flags."""
+    if only_models:
+        return SECTIONS_ONLY_MODELS
+    if only_agents:
+        return SECTIONS_ONLY_AGENTS
+    return SECTIONS_ALL
+
+
+def merge_sections(source: dict, target: dict, sections: tuple = SECTIONS_ALL, apply: bool = True) -> list:
+    """Merge sections of source into target in place.
+
+    Returns a (path, status) pair per section, where status is MISSING,
+    UNCHANGED or CHANGED. With apply=False nothing is modified.
+    """
+    # Section paths are disjoint, so target values can be looked up
+    # before any section is written
+    keys_list = tuple(keys for _, keys in sections)
+    src_vals = _get_keys_multi(source, keys_list)
+    tgt_vals = _get_keys_multi(target, keys_list)
+
+    results = []
+    for (path, keys), src_val, tgt_val in zip(sections, src_vals, tgt_vals):
+        if src_val is None:
+            results.append((path, MISSING))
+            continue
+
+        if tgt_val == src_val:
+            results.append((path, UNCHANGED))
+            continue
+
+        if apply:
+            # source is discarded after the merge, so no copy is needed;
+            # missing parent dicts are created on the way down
+            _set_keys(target, keys, src_val)
+        results.append((path, CHANGED))
+    return results
+
+
+def merge_ollama_config(source_json: bytes, target_json: bytes, sections: tuple = SECTIONS_ALL) -> bytes:
+    """Merge a source config into a target config, both given as JSON bytes.
+
+    Returns the merged target as JSON bytes. Batch callers can import this
+    module once and merge many configs without a new interpreter per file.
+    """
+    target = parse_json(target_json)
+    merge_sections(parse_json(source_json), target, sections)
+    return dump_json(target)
+
+
+def parse_json(data: bytes) -> Any:
+    """Parse JSON from raw bytes (uses orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_json(path: Path) -> Any:
+    """Load a JSON file from raw bytes."""
+    return parse_json(path.read_bytes())
+
+
+def dump_json(obj: Any) -> bytes:
+    """Serialize to indented JSON bytes in one pass (uses orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def create_backup(path: Path) -> Path:
+    """Copy path to a .bak sibling and return the backup path.
+
+    Only contents and permission bits are copied; timestamps and xattrs
+    are irrelevant for a config backup.
+    """
+    backup_path = path.with_suffix(path.suffix + ".bak")
+    shutil.copyfile(path, backup_path)
+    shutil.copymode(path, backup_path)
+    return backup_path
+
+
+def write_atomic(path: Path, payload: bytes) -> None:
+    """Write payload to a sibling temp file, then rename it over path.
+
+    A symlinked path is resolved first so the link's target is replaced,
+    not the link itself.
+    """
+    path = path.resolve()
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+    try:
+        # Keep the original permissions (openclaw.json may hold secrets);
+        # they are set before any payload bytes reach the temp file
+        tmp.unlink(missing_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666 if mode is None else mode)
+        with os.fdopen(fd, "wb") as f:
+            if mode is not None:
+                os.fchmod(f.fileno(), mode)
+            f.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def emit(lines: list) -> None:
+    """Write collected output lines with a single write, then clear them."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    lines.clear()
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Merge Ollama cloud model configuration into OpenClaw config.",
+        # __doc__ is None under python -OO
+        epilog=__doc__[__doc__.index("Examples:"):] if __doc__ else None,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--source", type=Path, default=Path(__file__).parent / "openclaw-ollama-cloud.json",
+        help="Path to ollama cloud config, or - for stdin (default: ./openclaw-ollama-cloud.json)",
+    )
+    parser.add_argument(
+        "--target", type=Path, default=None,
+        help="Path to openclaw.json (default: ~/.openclaw/openclaw.json)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change without applying")
+    parser.add_argument("--backup", action="store_true", help="Create .bak backup of target before modifying")
+    only = parser.add_mutually_exclusive_group()
+    only.add_argument("--only-models", action="store_true", help="Only merge models.providers.ollama section")
+    only.add_argument("--only-agents", action="store_true", help="Only merge agents.defaults.model section")
+    args = parser.parse_args(argv)
+    if args.target is None:
+        # Resolved lazily: expanding ~ is skipped when --target is given
+        args.target = Path.home() / ".openclaw" / "openclaw.json"
+    return args
+
+
+def _common_prefix(sections: tuple) -> tuple:
+    """Longest key prefix shared by every section."""
+    prefix = sections[0][1]
+    for _, keys in sections[1:]:
+        n = 0
+        while n < min(len(prefix), len(keys)) and prefix[n] == keys[n]:
+            n += 1
+        prefix = prefix[:n]
+    return prefix
+
+
+def load_source(path: Path, sections: tuple = SECTIONS_ALL) -> dict:
+    """Load the parts of the source config that sections need.
+
+    path may be STDIN to read the config from standard input.
+
+    With ijson installed and a narrower selection than a full merge, only
+    the subtree under the sections' common prefix is built; the rest of the
+    file is scanned but never materialized. The scan always runs to the end,
+    so a truncated or corrupt source is rejected just as with a full parse.
+    """
+    from_stdin = path == STDIN
+    prefix = _common_prefix(sections)
+    if ijson is None or not prefix:
+        return parse_json(sys.stdin.buffer.read()) if from_stdin else load_json(path)
+
+    with contextlib.nullcontext(sys.stdin.buffer) if from_stdin else open(path, "rb") as f:
+        subtree = None
+        # Keep the last match, as json/orjson do for duplicate keys
+        for subtree in ijson.items(f, ".".join(prefix), use_float=True):
+            pass
+    source = {}
+    if subtree is not None:
+        _set_keys(source, prefix, subtree)
+    return source
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    dry_run = args.dry_run
+    backup = args.backup
+    only_models = args.only_models
+    only_agents = args.only_agents
+    source_path = args.source
+    target_path = args.target
+
+    # Output is collected and written in one call at each exit point
+    out = []
+
+    # Validate paths
+    if source_path != STDIN and not source_path.exists():
+        out.append(f"❌ Source config not found: {source_path}")
+        emit(out)
+        sys.exit(1)
+
+    if not target_path.exists():
+        out.append(f"❌ Target config not found: {target_path}")
+        out.append("   Run 'openclaw doctor' first to initialize.")
+        emit(out)
+        sys.exit(1)
+
+    # Determine what to merge
+    sections_to_merge = select_sections(only_models, only_agents)
+
+    # Load configs
+    source = load_source(source_path, sections_to_merge)
+    target_bytes = target_path.read_bytes()
+    target = parse_json(target_bytes)
+
+    # Preview or apply changes
+    out.append(f"{'🔄' if not dry_run else '👁️'}  {'Merging' if not dry_run else 'Previewing'} Ollama cloud config")
+    out.append(f"   Source: {'<stdin>' if source_path == STDIN else source_path}")
+    out.append(f"   Target: {target_path}")
+    out.append("")
+
+    changes = []
+
+    for path, status in merge_sections(source, target, sections_to_merge, apply=not dry_run):
+        if status == MISSING:
+            out.append(f"   ⚠️  Skipping {path} (not found in source)")
+        elif status == UNCHANGED:
+            changes.append(f"   ✅ {path}: already up to date")
+        elif dry_run:
+            changes.append(f"   📝 {path}: would update")
+        else:
+            changes.append(f"   ✅ {path}: updated")
+
+    out.extend(changes)
+
+    if dry_run:
+        out.append("")
+        out.append("🏁 Dry run complete. Use without --dry-run to apply changes.")
+        emit(out)
+        sys.exit(0)
+
+    # Nothing to do if the file already holds exactly what we'd write
+    payload = dump_json(target)
+    if payload == target_bytes:
+        out.append("")
+        out.append("✅ No changes to write. Target left untouched.")
+        emit(out)
+        sys.exit(0)
+
+    # Show progress before touching the filesystem
+    emit(out)
+
+    # Create backup if requested
+    if backup:
+        backup_path = create_backup(target_path)
+        out.append(f"   💾 Backup created: {backup_path}")
+
+    # Write merged config
+    write_atomic(target_path, payload)
+
+    out.extend(_MERGE_COMPLETE)
+    emit(out)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Shared pytest configuration and fixtures for the test suite.
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).parent.parent
+SOURCE_CONFIG = REPO_DIR / "openclaw-ollama-cloud.json"
+
+# Make merge_config importable from the repo root
+sys.path.insert(0, str(REPO_DIR))
+
+import merge_config  # noqa: E402
+
+
+class SubprocessRunner:
+    """Run commands with output captured in reusable temp files.
+
+    The child writes straight into two files that live for the whole
+    session, so no pipes or reader threads are set up per call.
+    """
+
+    def __init__(self):
+        self.stdout = tempfile.TemporaryFile()
+        self.stderr = tempfile.TemporaryFile()
+
+    @staticmethod
+    def _drain(f):
+        f.seek(0)
+        data = f.read()
+        f.seek(0)
+        f.truncate()
+        return data
+
+    def run(self, cmd, merge_stderr=False, text=True, **kwargs):
+        """Run cmd and return a CompletedProcess (bytes output unless text)."""
+        returncode = subprocess.call(
+            cmd,
+            stdout=self.stdout,
+            stderr=subprocess.STDOUT if merge_stderr else self.stderr,
+            **kwargs
+        )
+        stdout = self._drain(self.stdout)
+        stderr = self._drain(self.stderr)
+        if text:
+            stdout, stderr = stdout.decode(), stderr.decode()
+        return subprocess.CompletedProcess(cmd, returncode, stdout, stderr)
+
+    def close(self):
+        self.stdout.close()
+        self.stderr.close()
+
+
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line("markers", "destructive: test restarts or otherwise disrupts the E2E container")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Run destructive tests last; skip them on pytest-xdist workers.
+
+    A container restart kills every worker's shell, so parallel runs leave
+    these tests to a separate serial ``pytest -m destructive`` run.
+    """
+    destructive = [item for item in items if item.get_closest_marker("destructive")]
+    if hasattr(config, "workerinput"):
+        skip = pytest.mark.skip(reason="destructive; run serially with -m destructive")
+        for item in destructive:
+            item.add_marker(skip)
+    items[:] = [item for item in items if item not in destructive] + destructive
+
+
+@pytest.fixture(scope="session")
+def source_config_dict():
+    """Parsed openclaw-ollama-cloud.json, loaded once per session (read-only)."""
+    return merge_config.load_json(SOURCE_CONFIG)
+
+
+@pytest.fixture(scope="session")
+def subprocess_runner():
+    """Session-wide SubprocessRunner."""
+    runner = SubprocessRunner()
+    yield runner
+    runner.close()
@@ -3,11 +3,18 @@
 E2E Docker tests for openclaw-ollama-cloud-configs using openclaw-e2e
 
 Run with: python3 -m pytest tests/test_e2e_docker.py -v
+Parallel:  python3 -m pytest tests/test_e2e_docker.py -n auto -m "not destructive"
+           python3 -m pytest tests/test_e2e_docker.py -m destructive
 Prerequisites: openclaw-e2e skill installed, Docker running
 """
 
+import fcntl
+import io
 import json
+import os
+import shlex
 import subprocess
+import tarfile
 import time
 from pathlib import Path
 
@@ -16,157 +23,278 @@ import pytest
 # Paths
 REPO_DIR = Path(__file__).parent.parent
 E2E_SCRIPT = Path(__file__).parent.parent.parent / "openclaw-skills" / "openclaw-e2e-skill" / "scripts" / "openclaw-e2e"
+E2E_SCRIPT_EXISTS = E2E_SCRIPT.exists()
 
+# Namespace per-test files by xdist worker so parallel runs don't collide
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
 
-class TestOpenClawE2E:
-    """E2E tests using openclaw-e2e Docker container."""
+# Markers printed by the shared container shell after each command
+RC_MARKER = "__E2E_RC__:"
+STDERR_MARKER = "__E2E_STDERR_END__"
 
-    @pytest.fixture(scope="class", autouse=True)
-    def ensure_container_running(self):
-        """Ensure container is running before tests."""
-        # Check if container is already running
+
+def tar_bytes(files):
+    """Build an in-memory tar archive from a {name: bytes} mapping."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def repo_tar_bytes():
+    """Build an in-memory tar archive of the local checkout."""
+    def exclude(info):
+        parts = Path(info.name).parts
+        if any((part.startswith(".") and part != ".") or part == "__pycache__" for part in parts):
+            return None
+        return info
+
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        tar.add(REPO_DIR, arcname=".", filter=exclude)
+    return buf.getvalue()
+
+
+def upload_tar(dest, data):
+    """Extract a tar archive into dest inside the container in one exec."""
+    return subprocess.run(
+        ["docker", "exec", "-i", "openclaw-dev-test",
+         "sh", "-c", 'mkdir -p "$1" && tar xf - -C "$1"', "sh", dest],
+        input=data,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True
+    )
+
+
+def upload_files(dest, files):
+    """Stream files into the container with a single tar | docker exec."""
+    return upload_tar(dest, tar_bytes(files))
+
+
+def read_until_marker(stream, marker):
+    """Read lines until one ends with marker; return (text, marker suffix)."""
+    chunks = []
+    while True:
+        line = stream.readline().decode()
+        if not line:
+            raise RuntimeError("Container shell exited unexpectedly")
+        idx = line.rfind(marker)
+        if idx != -1:
+            chunks.append(line[:idx])
+            return "".join(chunks), line[idx + len(marker):].strip()
+        chunks.append(line)
+
+
+def wait_ready(name="openclaw-dev-test", timeout=10.0):
+    """Poll the container until it accepts exec calls, up to timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            probe = subprocess.run(
+                ["docker", "exec", name, "true"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=1
+            )
+            if probe.returncode == 0:
+                return
+        except subprocess.TimeoutExpired:
+            pass
+        time.sleep(0.1)
+    pytest.fail(f"Container {name} not ready after {timeout}s")
+
+
+def open_container_shell():
+    """Open a long-lived shell inside the container."""
+    return subprocess.Popen(
+        ["docker", "exec", "-i", "openclaw-dev-test", "/bin/sh"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL
+    )
+
+
+def close_container_shell(shell):
+    """Close a shell opened with open_container_shell."""
+    try:
+        shell.stdin.close()
+        shell.wait(timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        shell.kill()
+
+
+@pytest.fixture(scope="session")
+def docker_ps_names():
+    """Names of running containers, queried once per session."""
+    try:
         result = subprocess.run(
             ["docker", "ps", "--format", "{{.Names}}"],
             capture_output=True,
             text=True
         )
-        
-        if "openclaw-dev-test" not in result.stdout:
-            # Try to start it
-            if E2E_SCRIPT.exists():
-                start_result = subprocess.run(
-                    [str(E2E_SCRIPT), "start"],
-                    capture_output=True,
-                    text=True
-                )
-                if start_result.returncode != 0:
-                    pytest.skip(f"Could not start E2E container: {start_result.stderr}")
-            else:
-                pytest.skip("E2E script not found")
-            
-            # Wait for container to be ready
-            time.sleep(5)
-        
+    except FileNotFoundError:
+        pytest.skip("Docker not installed")
+    return set(result.stdout.split())
+
+
+@pytest.fixture(scope="session")
+def ensure_container_running(docker_ps_names):
+    """Ensure container is running before tests (once per session)."""
+    if "openclaw-dev-test" not in docker_ps_names:
+        # Try to start it
+        if E2E_SCRIPT_EXISTS:
+            start_result = subprocess.run(
+                [os.fspath(E2E_SCRIPT), "start"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True
+            )
+            if start_result.returncode != 0:
+                pytest.skip(f"Could not start E2E container: {start_result.stderr}")
+        else:
+            pytest.skip("E2E script not found")
+
+        # Wait for container to be ready, then record it as running
+        wait_ready()
+        docker_ps_names.add("openclaw-dev-test")
+
+    return "openclaw-dev-test"
+
+
+@pytest.fixture(scope="session")
+def repo_in_container(ensure_container_running, tmp_path_factory):
+    """Copy the local checkout into the container once per run; return its path.
+
+    Each xdist worker has its own session, so the first worker to take the
+    lock uploads and the others wait for it and reuse the copy.
+    """
+    repo_path = "/home/node/openclaw-ollama-cloud-configs"
+    if "PYTEST_XDIST_WORKER" not in os.environ:
+        upload_tar(repo_path, repo_tar_bytes())
+        return repo_path
+
+    # The parent of each worker's base temp dir is shared by the whole run
+    done = tmp_path_factory.getbasetemp().parent / "repo-in-container.done"
+    with open(done.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if not done.exists():
+            upload_tar(repo_path, repo_tar_bytes())
+            done.touch()
+    return repo_path
+
+
+def worker_file(name):
+    """Return a per-worker file name for files written into the container."""
+    return f"worker-{WORKER_ID}-{name}"
+
+
+class ContainerTestBase:
+    """Shared fixtures and helpers for tests running in the E2E container."""
+
+    @pytest.fixture(scope="class", autouse=True)
+    def container_shell(self, request, ensure_container_running):
+        """Share one docker exec shell across the class instead of one per command."""
+        request.cls._shell = open_container_shell()
         yield
+        close_container_shell(request.cls._shell)
+
+    def reopen_shell(self):
+        """Replace the shared shell (e.g. after the container restarted)."""
+        close_container_shell(self._shell)
+        type(self)._shell = open_container_shell()
 
     def run_e2e_exec(self, *args):
-        """Run command inside E2E container."""
-        # Use docker exec directly instead of the wrapper script
-        cmd = ["docker", "exec", "openclaw-dev-test"] + list(args)
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=REPO_DIR
+        """Run command inside E2E container via the shared shell."""
+        # stdin is detached so commands can't swallow the next request;
+        # stderr is buffered to a file and replayed after the exit code
+        stderr_file = f"/tmp/e2e-stderr-{WORKER_ID}"
+        script = (
+            f"{shlex.join(args)} </dev/null 2>{stderr_file}; "
+            f"printf '{RC_MARKER}%s\\n' $?; "
+            f"cat {stderr_file}; echo {STDERR_MARKER}\n"
         )
-        return result
+        self._shell.stdin.write(script.encode())
+        self._shell.stdin.flush()
+
+        stdout, returncode = read_until_marker(self._shell.stdout, RC_MARKER)
+        stderr, _ = read_until_marker(self._shell.stdout, STDERR_MARKER)
+        return subprocess.CompletedProcess(list(args), int(returncode), stdout, stderr)
 
-    def test_container_is_running(self):
+
+class TestOpenClawE2E(ContainerTestBase):
+    """E2E tests using openclaw-e2e Docker container."""
+
+    def test_container_is_running(self, docker_ps_names):
         """Test that E2E container is running."""
-        result = subprocess.run(
-            ["docker", "ps", "--format", "{{.Names}}"],
-            capture_output=True,
-            text=True
-        )
-        assert "openclaw-dev-test" in result.stdout
+        assert "openclaw-dev-test" in docker_ps_names
 
-    def test_copy_repo_to_container(self):
-        """Test that we can clone the public repo inside the container."""
-        # Clone the public repo inside container
-        result = self.run_e2e_exec(
-            "git", "clone", "https://github.com/ambushalgorithm/openclaw-ollama-cloud-configs.git",
-            "/home/node/openclaw-ollama-cloud-configs"
-        )
-        # Git may fail if directory exists, that's ok
-        assert result.returncode == 0 or "already exists" in result.stderr.lower()
-        
-        # Verify files exist
-        result = self.run_e2e_exec("ls", "/home/node/openclaw-ollama-cloud-configs/")
+    def test_copy_repo_to_container(self, repo_in_container):
+        """Test that the local checkout was copied into the container."""
+        result = self.run_e2e_exec("ls", f"{repo_in_container}/")
         assert "merge-config.py" in result.stdout
+        assert "openclaw-ollama-cloud.json" in result.stdout
 
-    def ensure_repo_cloned(self):
-        """Ensure repo is cloned in container."""
-        # Check if already cloned
-        check = self.run_e2e_exec("ls", "/home/node/openclaw-ollama-cloud-configs/merge-config.py")
-        if check.returncode != 0:
-            # Clone the repo
-            self.run_e2e_exec(
-                "git", "clone", "https://github.com/ambushalgorithm/openclaw-ollama-cloud-configs.git",
-                "/home/node/openclaw-ollama-cloud-configs"
-            )
+        # Executable bits survive the tar upload
+        result = self.run_e2e_exec("test", "-x", f"{repo_in_container}/setup-ollama.sh")
+        assert result.returncode == 0
 
-    def test_merge_config_inside_container(self, tmp_path):
+    def test_merge_config_inside_container(self, repo_in_container):
         """Test running merge-config.py inside container."""
-        # Ensure repo is cloned
-        self.ensure_repo_cloned()
-        
         # Create a minimal test config
         test_config = {
             "models": {"providers": {"ollama": {"models": []}}},
             "agents": {"defaults": {"model": {}, "models": {}}}
         }
         
-        # Write locally
-        local_config = tmp_path / "test_openclaw.json"
-        local_config.write_text(json.dumps(test_config))
-        
-        # Copy to container (use different name to avoid busy error)
-        result = subprocess.run(
-            ["docker", "cp", str(local_config), "openclaw-dev-test:/home/node/.openclaw/test-merge.json"],
-            capture_output=True,
-            text=True
-        )
+        # Stream to container (use different name to avoid busy error)
+        merge_file = worker_file("test-merge.json")
+        upload_files("/home/node/.openclaw", {merge_file: json.dumps(test_config).encode()})
         
         # Run merge inside container (using the test config)
         result = self.run_e2e_exec(
             "python3",
-            "/home/node/openclaw-ollama-cloud-configs/merge-config.py",
+            f"{repo_in_container}/merge-config.py",
             "--dry-run",
-            "--source", "/home/node/openclaw-ollama-cloud-configs/openclaw-ollama-cloud.json",
-            "--target", "/home/node/.openclaw/test-merge.json"
+            "--source", f"{repo_in_container}/openclaw-ollama-cloud.json",
+            "--target", f"/home/node/.openclaw/{merge_file}"
         )
         
         # Should succeed (dry-run)
         assert result.returncode == 0 or "Previewing" in result.stdout
 
-    def ensure_repo_cloned(self):
-        """Ensure repo is cloned in container."""
-        check = self.run_e2e_exec("ls", "/home/node/openclaw-ollama-cloud-configs/merge-config.py")
-        if check.returncode != 0:
-            self.run_e2e_exec(
-                "git", "clone", "https://github.com/ambushalgorithm/openclaw-ollama-cloud-configs.git",
-                "/home/node/openclaw-ollama-cloud-configs"
-            )
-
-    def test_setup_ollama_status_inside_container(self):
+    def test_setup_ollama_status_inside_container(self, repo_in_container):
         """Test running setup-ollama.sh status inside container."""
-        # Ensure repo is cloned
-        self.ensure_repo_cloned()
-        
         result = self.run_e2e_exec(
             "bash",
-            "/home/node/openclaw-ollama-cloud-configs/setup-ollama.sh",
+            f"{repo_in_container}/setup-ollama.sh",
             "status"
         )
         
         # Should run (may fail if ollama not running, but should execute)
         assert "status" in result.stdout.lower() or result.returncode in [0, 1]
 
-    def test_setup_ollama_aliases_inside_container(self):
+    def test_setup_ollama_aliases_inside_container(self, repo_in_container):
         """Test running setup-ollama.sh aliases inside container."""
-        # Ensure repo is cloned
-        self.ensure_repo_cloned()
-        
         result = self.run_e2e_exec(
             "bash",
-            "/home/node/openclaw-ollama-cloud-configs/setup-ollama.sh",
+            f"{repo_in_container}/setup-ollama.sh",
             "aliases"
         )
         
         # Should run without crashing
-        assert len(result.stdout + result.stderr) > 0
+        assert result.stdout or result.stderr
+
 
-    def test_config_survives_container_restart(self, tmp_path):
+@pytest.mark.destructive
+class TestOpenClawE2ERestart(ContainerTestBase):
+    """Container restart tests; run last, and never alongside xdist workers."""
+
+    def test_config_survives_container_restart(self):
         """Test that config persists after container restart."""
         # Create test config
         test_config = {
@@ -174,37 +302,36 @@ class TestOpenClawE2E:
             "models": {"providers": {"ollama": {"test": True}}}
         }
         
-        local_config = tmp_path / "restart_test.json"
-        local_config.write_text(json.dumps(test_config))
+        # Stream to container
+        config_file = worker_file("test_config.json")
+        upload_files("/home/node/.openclaw", {config_file: json.dumps(test_config).encode()})
         
-        # Copy to container
+        # Restart container (this kills the shared shell)
         subprocess.run(
-            ["docker", "cp", str(local_config), "openclaw-dev-test:/home/node/.openclaw/test_config.json"],
+            ["docker", "restart", "openclaw-dev-test"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             check=True
         )
-        
-        # Restart container
-        subprocess.run(["docker", "restart", "openclaw-dev-test"], check=True)
-        time.sleep(3)
+        wait_ready()
+        self.reopen_shell()
         
         # Check config still exists
-        result = self.run_e2e_exec("cat", "/home/node/.openclaw/test_config.json")
+        result = self.run_e2e_exec("cat", f"/home/node/.openclaw/{config_file}")
         assert "test" in result.stdout
         assert "value" in result.stdout
 
 
+@pytest.mark.skipif(not E2E_SCRIPT_EXISTS, reason="E2E script not found")
 class TestOpenClawE2ECommands:
     """Test openclaw-e2e script commands directly."""
 
     def test_e2e_status_command(self):
         """Test openclaw-e2e status command."""
-        if not E2E_SCRIPT.exists():
-            pytest.skip("E2E script not found")
-        
         result = subprocess.run(
-            [str(E2E_SCRIPT), "status"],
-            capture_output=True,
-            text=True
+            [os.fspath(E2E_SCRIPT), "status"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
         )
         
         # Should run without error
@@ -212,12 +339,10 @@ class TestOpenClawE2ECommands:
 
     def test_e2e_help_command(self):
         """Test openclaw-e2e help command."""
-        if not E2E_SCRIPT.exists():
-            pytest.skip("E2E script not found")
-        
         result = subprocess.run(
-            [str(E2E_SCRIPT), "help"],
-            capture_output=True,
+            [os.fspath(E2E_SCRIPT), "help"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True
         )
         
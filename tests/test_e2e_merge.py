@@ -1,203 +1,175 @@
 #!/usr/bin/env python3
 """
-E2E Subprocess tests for merge-config.py
+E2E tests for merge-config.py
+
+merge-config.py runs in-process through main(argv) to avoid an interpreter
+start per test; the CLI wiring itself is covered by one real subprocess test.
 
 Run with: python3 -m pytest tests/test_e2e_merge.py -v
 """
 
+import contextlib
+import io
 import json
 import os
 import shutil
 import subprocess
 import sys
-import tempfile
+import traceback
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
+import merge_config
+
 # Paths
 REPO_DIR = Path(__file__).parent.parent
 MERGE_SCRIPT = REPO_DIR / "merge-config.py"
 SOURCE_CONFIG = REPO_DIR / "openclaw-ollama-cloud.json"
 
 
-class TestMergeConfigSubprocess:
-    """E2E tests for merge-config.py using subprocess."""
+TARGET_CONFIG = {
+    "models": {
+        "providers": {
+            "ollama": {
+                "baseUrl": "http://127.0.0.1:11434/v1",
+                "apiKey": "ollama-local",
+                "models": [{"id": "old-model"}]
+            }
+        }
+    },
+    "agents": {
+        "defaults": {
+            "model": {
+                "primary": "old-model",
+                "fallbacks": []
+            },
+            "models": {"keep": {"alias": "keep"}}
+        }
+    }
+}
 
-    @pytest.fixture
-    def temp_dir(self, tmp_path):
-        """Create a temp directory for test files."""
-        return tmp_path
+
+@pytest.fixture(scope="module")
+def target_template(tmp_path_factory):
+    """Write the target config once per module; tests copy it."""
+    template = tmp_path_factory.mktemp("merge") / "template.json"
+    template.write_text(json.dumps(TARGET_CONFIG, separators=(",", ":"), ensure_ascii=False))
+    return template
+
+
+def check_dry_run(result, target_file, original, source):
+    """--dry-run shows a preview and leaves the target untouched."""
+    assert "Previewing" in result.stdout or "dry run" in result.stdout.lower()
+    assert target_file.read_text() == original
+
+
+def check_backup(result, target_file, original, source):
+    """--backup writes a .bak copy of the original and updates the target."""
+    bak_file = target_file.with_suffix(".json.bak")
+    assert bak_file.exists()
+    assert bak_file.read_text() == original
+    assert target_file.read_text() != original
+
+
+def check_only_models(result, target_file, original, source):
+    """--only-models replaces the models section and keeps agents."""
+    merged = json.loads(target_file.read_text())
+    assert merged["models"]["providers"]["ollama"] == source["models"]["providers"]["ollama"]
+    assert merged["agents"] == TARGET_CONFIG["agents"]
+
+
+def check_only_agents(result, target_file, original, source):
+    """--only-agents replaces the agent defaults and keeps models."""
+    merged = json.loads(target_file.read_text())
+    assert merged["models"] == TARGET_CONFIG["models"]
+    assert merged["agents"]["defaults"]["model"] == source["agents"]["defaults"]["model"]
+    assert merged["agents"]["defaults"]["models"] == source["agents"]["defaults"]["models"]
+
+
+class TestMergeConfigSubprocess:
+    """E2E tests for merge-config.py in-process via main(argv); one real CLI run."""
 
     @pytest.fixture
-    def valid_target_config(self, temp_dir):
+    def valid_target_config(self, target_template, tmp_path):
         """Create a valid target openclaw.json config."""
-        config = {
-            "models": {
-                "providers": {
-                    "ollama": {
-                        "baseUrl": "http://127.0.0.1:11434/v1",
-                        "apiKey": "ollama-local",
-                        "models": [{"id": "old-model"}]
-                    }
-                }
-            },
-            "agents": {
-                "defaults": {
-                    "model": {
-                        "primary": "old-model",
-                        "fallbacks": []
-                    },
-                    "models": {}
-                }
-            }
-        }
-        config_file = temp_dir / "openclaw.json"
-        config_file.write_text(json.dumps(config, indent=2))
-        return config_file
+        return shutil.copy(target_template, tmp_path / "openclaw.json")
 
-    @pytest.fixture
-    def minimal_target_config(self, temp_dir):
-        """Create a minimal target config (no existing models)."""
-        config = {}
-        config_file = temp_dir / "openclaw.json"
-        config_file.write_text(json.dumps(config, indent=2))
-        return config_file
-
-    def run_merge_script(self, *args, source_path=None, target_path=None, cwd=None):
-        """Helper to run merge-config.py with given args."""
-        cmd = [sys.executable, str(MERGE_SCRIPT)]
-        cmd.extend(args)
-        
-        env = os.environ.copy()
-        if source_path:
-            # Can't pass --source easily via env, just use args
-            pass
-        if target_path:
-            pass
-            
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=cwd or REPO_DIR,
-            env=env
-        )
-        return result
+    @pytest.fixture(autouse=True)
+    def session_helpers(self, subprocess_runner):
+        """Expose the session subprocess runner to helpers."""
+        self.runner = subprocess_runner
 
-    def test_dry_run_shows_preview(self, valid_target_config):
-        """Test that --dry-run shows preview without modifying files."""
-        original_content = valid_target_config.read_text()
-        
-        result = self.run_merge_script(
-            "--dry-run",
-            "--source", str(SOURCE_CONFIG),
-            "--target", str(valid_target_config)
-        )
-        
-        # Should succeed
-        assert result.returncode == 0
-        
-        # Should show preview text
-        assert "Previewing" in result.stdout or "dry run" in result.stdout.lower()
-        
-        # Should NOT modify the target file
-        assert valid_target_config.read_text() == original_content
+    def run_merge_script(self, *args, input=b""):
+        """Helper to run merge-config.py's main() in-process with given args.
+
+        ``input`` is fed to stdin as bytes, as for ``--source -``.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        stdin = io.TextIOWrapper(io.BytesIO(input))
+        returncode = 0
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), \
+                patch.object(sys, "stdin", stdin):
+            try:
+                merge_config.main(list(args))
+            except SystemExit as exc:
+                returncode = exc.code if isinstance(exc.code, int) else int(exc.code is not None)
+            except Exception:
+                # Mirror the interpreter: traceback on stderr, exit status 1
+                traceback.print_exc()
+                returncode = 1
+        return subprocess.CompletedProcess(list(args), returncode, stdout.getvalue(), stderr.getvalue())
+
+    def run_merge_cli(self, *args):
+        """Helper to run merge-config.py as a real subprocess."""
+        return self.runner.run([sys.executable, os.fspath(MERGE_SCRIPT), *args], cwd=REPO_DIR)
+
+    @pytest.mark.parametrize("flag, check", [
+        ("--dry-run", check_dry_run),
+        ("--backup", check_backup),
+        ("--only-models", check_only_models),
+        ("--only-agents", check_only_agents),
+    ], ids=["dry-run", "backup", "only-models", "only-agents"])
+    def test_merge_flags(self, flag, check, target_template, source_config_dict):
+        """Test each merge flag against a copy of the shared target config."""
+        target_file = shutil.copy(target_template, target_template.with_name(f"{flag.lstrip('-')}.json"))
+        original = target_file.read_text()
 
-    def test_backup_creates_bak_file(self, valid_target_config):
-        """Test that --backup creates a .bak file."""
-        # Run with backup
         result = self.run_merge_script(
-            "--backup",
-            "--source", str(SOURCE_CONFIG),
-            "--target", str(valid_target_config)
+            flag,
+            "--source", os.fspath(SOURCE_CONFIG),
+            "--target", os.fspath(target_file)
         )
-        
+
         assert result.returncode == 0
-        
-        # Check .bak file exists
+        check(result, target_file, original, source_config_dict)
+
+    def test_rerun_skips_backup_and_write(self, valid_target_config):
+        """Test that a re-run with nothing to change leaves the target alone."""
+        args = ("--backup", "--source", os.fspath(SOURCE_CONFIG), "--target", os.fspath(valid_target_config))
+        assert self.run_merge_script(*args).returncode == 0
+
         bak_file = valid_target_config.with_suffix(".json.bak")
-        assert bak_file.exists()
-        
-        # Original should be modified
-        new_content = valid_target_config.read_text()
-        assert new_content != ""
-
-    def test_only_models_updates_models_section(self, temp_dir):
-        """Test that --only-models only updates models section."""
-        # Create target with existing agents config
-        target_config = {
-            "models": {"providers": {"ollama": {"models": [{"id": "old"}]}}},
-            "agents": {
-                "defaults": {
-                    "model": {"primary": "keep-this"},
-                    "models": {"keep": {"alias": "keep"}}
-                }
-            }
-        }
-        target_file = temp_dir / "openclaw.json"
-        target_file.write_text(json.dumps(target_config))
-        
-        result = self.run_merge_script(
-            "--only-models",
-            "--source", str(SOURCE_CONFIG),
-            "--target", str(target_file)
-        )
-        
-        assert result.returncode == 0
-        
-        # Reload config
-        with open(target_file) as f:
-            result_config = json.load(f)
-        
-        # Models should be updated
-        models = result_config.get("models", {}).get("providers", {}).get("ollama", {}).get("models", [])
-        assert len(models) > 1  # Should have multiple models from source
-        
-        # Agents should be unchanged
-        assert result_config.get("agents", {}).get("defaults", {}).get("model", {}).get("primary") == "keep-this"
-
-    def test_only_agents_updates_agents_section(self, temp_dir):
-        """Test that --only-agents only updates agents section."""
-        target_config = {
-            "models": {"providers": {"ollama": {"models": [{"id": "keep-model"}]}}},
-            "agents": {"defaults": {}}
-        }
-        target_file = temp_dir / "openclaw.json"
-        target_file.write_text(json.dumps(target_config))
-        
-        result = self.run_merge_script(
-            "--only-agents",
-            "--source", str(SOURCE_CONFIG),
-            "--target", str(target_file)
-        )
-        
+        bak_file.unlink()
+        merged_mtime = valid_target_config.stat().st_mtime_ns
+
+        result = self.run_merge_script(*args)
+
         assert result.returncode == 0
-        
-        # Reload
-        with open(target_file) as f:
-            result_config = json.load(f)
-        
-        # Models should be unchanged
-        models = result_config.get("models", {}).get("providers", {}).get("ollama", {}).get("models", [])
-        assert len(models) == 1
-        assert models[0]["id"] == "keep-model"
-        
-        # Agents should be updated
-        assert result_config.get("agents", {}).get("defaults", {}).get("model", {}).get("primary") != ""
+        assert "No changes to write" in result.stdout
+        assert not bak_file.exists()
+        assert valid_target_config.stat().st_mtime_ns == merged_mtime
 
-    def test_invalid_source_file_shows_error(self, temp_dir):
-        """Test that invalid source file shows appropriate error."""
-        invalid_source = temp_dir / "invalid.json"
-        invalid_source.write_text("not valid json {{{")
-        
-        target_file = temp_dir / "target.json"
+    def test_invalid_source_file_shows_error(self, tmp_path):
+        """Test that an invalid source piped on stdin shows appropriate error."""
+        target_file = tmp_path / "target.json"
         target_file.write_text("{}")
         
         result = self.run_merge_script(
-            "--source", str(invalid_source),
-            "--target", str(target_file)
+            "--source", "-",
+            "--target", os.fspath(target_file),
+            input=b"not valid json {{{",
         )
         
         # Should fail
@@ -206,42 +178,47 @@ class TestMergeConfigSubprocess:
         # Should show error message
         assert "error" in result.stdout.lower() or "error" in result.stderr.lower()
 
-    def test_missing_target_file_shows_error(self, temp_dir):
+    def test_source_from_stdin(self, valid_target_config):
+        """Test that --source - merges the config piped on stdin."""
+        result = self.run_merge_script(
+            "--source", "-",
+            "--target", os.fspath(valid_target_config),
+            input=SOURCE_CONFIG.read_bytes(),
+        )
+        
+        assert result.returncode == 0, result.stderr
+        assert "Source: <stdin>" in result.stdout
+        merged = json.loads(valid_target_config.read_text())
+        assert "ollama" in merged["models"]["providers"]
+
+    def test_missing_target_file_shows_error(self, tmp_path):
         """Test that missing target file shows appropriate error."""
-        nonexistent_target = temp_dir / "does_not_exist.json"
+        nonexistent_target = tmp_path / "does_not_exist.json"
         
         result = self.run_merge_script(
-            "--source", str(SOURCE_CONFIG),
-            "--target", str(nonexistent_target)
+            "--source", os.fspath(SOURCE_CONFIG),
+            "--target", os.fspath(nonexistent_target)
         )
         
         # Should fail
         assert result.returncode != 0
         
         # Should show error about missing target
-        output = result.stdout + result.stderr
-        assert "not found" in output.lower() or "error" in output.lower()
+        assert any(kw in stream.lower() for stream in (result.stdout, result.stderr) for kw in ("not found", "error"))
 
     def test_help_flag_shows_help(self):
-        """Test that -h or --help shows help message."""
-        result = self.run_merge_script("-h")
+        """Test that -h or --help shows help message (real CLI invocation)."""
+        result = self.run_merge_cli("-h")
         
         assert result.returncode == 0
         assert "--dry-run" in result.stdout or "--backup" in result.stdout
 
-    def test_merge_empty_target_with_cloud_config(self, minimal_target_config):
+    def test_merge_empty_target_with_cloud_config(self, source_config_dict):
         """Test merging cloud config into an empty target config."""
-        # This is the real-world scenario: empty openclaw.json + cloud config
-        result = self.run_merge_script(
-            "--source", str(SOURCE_CONFIG),
-            "--target", str(minimal_target_config)
-        )
-        
-        assert result.returncode == 0
-        
-        # Verify the merged config has the cloud models
-        with open(minimal_target_config) as f:
-            merged = json.load(f)
+        # This is the real-world scenario: empty openclaw.json + cloud config.
+        # Only the merged result is asserted, so no CLI run is needed.
+        merged = {}
+        merge_config.merge_sections(source_config_dict, merged)
         
         # Should have ollama models
         assert "models" in merged
@@ -251,6 +228,7 @@ class TestMergeConfigSubprocess:
         # Should have the cloud models from repo config
         models = merged["models"]["providers"]["ollama"]["models"]
         assert len(models) > 0
+        assert models == source_config_dict["models"]["providers"]["ollama"]["models"]
         
         # Should have the default model set
         assert "agents" in merged
@@ -258,46 +236,62 @@ class TestMergeConfigSubprocess:
         assert "model" in merged["agents"]["defaults"]
 
 
+SETUP_COMMANDS = ("status", "aliases", "invalid-command-xyz")
+
+
+@pytest.fixture(scope="module")
+def setup_results(subprocess_runner):
+    """Run every setup-ollama.sh command in one bash process.
+
+    Returns {command: (returncode, combined output bytes)}; output is only
+    searched for ASCII keywords, so it is never decoded.
+    """
+    script = REPO_DIR / "setup-ollama.sh"
+    batch = (
+        'for cmd in "$@"; do '
+        'echo "__SECTION__:$cmd"; bash "$0" "$cmd" 2>&1; echo "__RC__:$?"; '
+        'done'
+    )
+    result = subprocess_runner.run(
+        ["bash", "-c", batch, os.fspath(script), *SETUP_COMMANDS],
+        merge_stderr=True,
+        text=False,
+        cwd=REPO_DIR
+    )
+
+    results = {}
+    for section in result.stdout.split(b"__SECTION__:")[1:]:
+        cmd, _, body = section.partition(b"\n")
+        output, _, rc = body.rpartition(b"__RC__:")
+        results[cmd.decode()] = (int(rc), output)
+    return results
+
+
 class TestSetupOllamaSubprocess:
     """E2E tests for setup-ollama.sh using subprocess."""
 
-    def run_setup_script(self, *args):
-        """Helper to run setup-ollama.sh."""
-        script = REPO_DIR / "setup-ollama.sh"
-        cmd = ["bash", str(script)]
-        cmd.extend(args)
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=REPO_DIR
-        )
-        return result
-
-    def test_status_command_exists(self):
+    def test_status_command_exists(self, setup_results):
         """Test that setup-ollama.sh status command runs."""
-        result = self.run_setup_script("status")
+        returncode, output = setup_results["status"]
         
         # Should run (may fail if ollama not running, but should execute)
         # Just check it didn't crash with "command not found"
-        assert "status" in result.stdout.lower() or "error" in result.stdout.lower() or result.returncode in [0, 1]
+        output = output.lower()
+        assert b"status" in output or b"error" in output or returncode in [0, 1]
 
-    def test_aliases_command_exists(self):
+    def test_aliases_command_exists(self, setup_results):
         """Test that setup-ollama.sh aliases command runs."""
-        result = self.run_setup_script("aliases")
+        returncode, output = setup_results["aliases"]
         
-        # Should execute without crashing
-        output = result.stdout + result.stderr
-        # Should show some alias info
-        assert result.returncode in [0, 1, 126, 127] or len(output) > 0
+        # Should execute without crashing and show some alias info
+        assert returncode in [0, 1, 126, 127] or len(output) > 0
 
-    def test_invalid_command_shows_error(self):
+    def test_invalid_command_shows_error(self, setup_results):
         """Test that invalid command shows error."""
-        result = self.run_setup_script("invalid-command-xyz")
+        returncode, _ = setup_results["invalid-command-xyz"]
         
         # Should fail
-        assert result.returncode != 0
+        assert returncode != 0
 
 
 if __name__ == "__main__":
@@ -8,26 +8,29 @@ Or:        python3 tests/test_merge_config.py
 
 import json
 import os
-import shutil
-import sys
-import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-# Add parent dir to path for imports (handle hyphenated filename)
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-# Import from merge-config.py (handle hyphenated filename)
-import importlib.util
-spec = importlib.util.spec_from_file_location("merge_config", Path(__file__).parent.parent / "merge-config.py")
-merge_config = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(merge_config)
-
-deep_merge = merge_config.deep_merge
-get_nested = merge_config.get_nested
-set_nested = merge_config.set_nested
+import merge_config
+from merge_config import (
+    create_backup,
+    deep_merge,
+    dump_json,
+    get_nested,
+    get_nested_multi,
+    load_json,
+    load_source,
+    merge_ollama_config,
+    merge_sections,
+    parse_args,
+    select_sections,
+    set_nested,
+    write_atomic,
+)
+
+CLOUD_CONFIG = Path(__file__).parent.parent / "openclaw-ollama-cloud.json"
 
 
 class TestDeepMerge:
@@ -75,6 +78,14 @@ class TestDeepMerge:
         result = deep_merge(target, source)
         assert result == {"a": 1}
 
+    def test_merge_deeply_nested_dicts(self):
+        """Test merging dictionaries nested several levels deep."""
+        target = {"a": {"b": {"c": {"d": 1, "keep": True}}}}
+        source = {"a": {"b": {"c": {"d": 2}, "e": [1]}}}
+        result = deep_merge(target, source)
+        assert result is target
+        assert result == {"a": {"b": {"c": {"d": 2, "keep": True}, "e": [1]}}}
+
 
 class TestGetNested:
     """Tests for get_nested function."""
@@ -114,6 +125,56 @@ class TestGetNested:
         assert get_nested(obj, "a.b") is None
 
 
+class TestGetNestedMulti:
+    """Tests for get_nested_multi function."""
+
+    def test_matches_get_nested(self):
+        """Test results match get_nested for each path, in order."""
+        obj = {"a": {"b": {"c": 1, "d": [2]}, "e": 3}}
+        paths = ("a.b.d", "a.b.c", "a.e", "a.x.y", "z")
+
+        assert get_nested_multi(obj, paths) == tuple(get_nested(obj, p) for p in paths)
+
+    def test_shared_prefix_walked_once(self):
+        """Test each key along a shared prefix is looked up only once."""
+        lookups = []
+
+        class CountingDict(dict):
+            def get(self, key, default=None):
+                lookups.append(key)
+                return super().get(key, default)
+
+        obj = CountingDict(agents=CountingDict(defaults=CountingDict(model=1, models=2)))
+
+        assert get_nested_multi(obj, ("agents.defaults.model", "agents.defaults.models")) == (1, 2)
+        assert lookups == ["agents", "defaults", "model", "models"]
+
+    def test_non_dict_intermediate(self):
+        """Test paths through non-dict values return None."""
+        obj = {"a": {"b": "value"}}
+        assert get_nested_multi(obj, ("a.b.c", "a.b")) == (None, "value")
+
+    def test_empty_paths(self):
+        """Test no paths returns an empty tuple."""
+        assert get_nested_multi({"a": 1}, ()) == ()
+
+
+class TestSplitPath:
+    """Tests for the cached dot-path splitter."""
+
+    def test_split_returns_tuple(self):
+        """Test that paths split into an immutable key tuple."""
+        assert merge_config._split_path("models.providers.ollama") == ("models", "providers", "ollama")
+
+    def test_split_is_cached(self):
+        """Test that repeated lookups of a path hit the cache."""
+        merge_config._split_path.cache_clear()
+        get_nested({}, "agents.defaults.model")
+        set_nested({}, "agents.defaults.model", 1)
+        info = merge_config._split_path.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+
+
 class TestSetNested:
     """Tests for set_nested function."""
 
@@ -153,6 +214,43 @@ class TestSetNested:
         set_nested(obj, "outer.new.deep", 3)
         assert obj == {"outer": {"new": {"deep": 3}}}
 
+    def test_set_replaces_non_dict_intermediate(self):
+        """Test that a non-dict value on the path is replaced by a dict."""
+        obj = {"agents": None, "models": "stale"}
+        set_nested(obj, "agents.defaults.model", {"primary": "x"})
+        set_nested(obj, "models.providers", {})
+        assert obj == {"agents": {"defaults": {"model": {"primary": "x"}}}, "models": {"providers": {}}}
+
+
+class TestParseArgs:
+    """Tests for command-line argument parsing."""
+
+    def test_defaults(self):
+        """Test default argument values."""
+        args = parse_args([])
+        assert args.source.name == "openclaw-ollama-cloud.json"
+        assert args.target == Path.home() / ".openclaw" / "openclaw.json"
+        assert not (args.dry_run or args.backup or args.only_models or args.only_agents)
+
+    def test_equals_syntax(self, tmp_path):
+        """Test that --source=PATH and --target=PATH are accepted."""
+        args = parse_args([f"--source={tmp_path}/a.json", f"--target={tmp_path}/b.json", "--dry-run"])
+        assert args.source == tmp_path / "a.json"
+        assert args.target == tmp_path / "b.json"
+        assert args.dry_run
+
+    def test_without_docstring(self):
+        """Test parsing still works when docstrings are stripped (python -OO)."""
+        with patch.object(merge_config, "__doc__", None):
+            args = parse_args(["--dry-run"])
+
+        assert args.dry_run is True
+
+    def test_only_flags_are_exclusive(self):
+        """Test that --only-models and --only-agents can't be combined."""
+        with pytest.raises(SystemExit):
+            parse_args(["--only-models", "--only-agents"])
+
 
 class TestJsonParsing:
     """Tests for JSON parsing in merge-config.py."""
@@ -197,88 +295,114 @@ class TestJsonParsing:
 
         assert data == {"models": ["a", "b", "c"]}
 
+    def test_load_json_reads_file(self, tmp_path):
+        """Test that load_json parses a config file from disk."""
+        config_file = tmp_path / "config.json"
+        config_file.write_text('{"models": {"providers": {}}, "name": "caf\u00e9"}')
+
+        assert load_json(config_file) == {"models": {"providers": {}}, "name": "café"}
+
+    def test_dump_json_round_trip(self):
+        """Test that dump_json emits indented UTF-8 JSON with a trailing newline."""
+        data = {"models": [{"id": "a:cloud", "cost": 0.5}], "name": "café"}
+        payload = dump_json(data)
+
+        assert payload.endswith(b"}\n")
+        assert b'\n  "models": [' in payload
+        assert "café".encode() in payload
+        assert json.loads(payload) == data
+
+    def test_load_json_invalid(self, tmp_path):
+        """Test that load_json raises on invalid JSON with either parser."""
+        config_file = tmp_path / "invalid.json"
+        config_file.write_text('{"key": "value",}')
+
+        with pytest.raises(ValueError):
+            load_json(config_file)
+
 
 class TestMergeLogic:
     """Tests for the merge logic used in merge-config.py."""
 
-    def test_merge_models_section(self):
-        """Test merging models.providers.ollama section."""
-        target = {
-            "models": {
-                "providers": {
-                    "ollama": {"models": [{"id": "old-model"}]}
-                }
-            }
-        }
-        source = {
-            "models": {
-                "providers": {
-                    "ollama": {"models": [{"id": "new-model"}]}
-                }
-            }
-        }
-
-        tgt_val = get_nested(target, "models.providers.ollama")
-        src_val = get_nested(source, "models.providers.ollama")
+    @pytest.mark.parametrize(
+        "path, target, source, expected",
+        [
+            pytest.param(
+                "models.providers.ollama",
+                {"models": [{"id": "old-model"}]},
+                {"models": [{"id": "new-model"}]},
+                {"models": [{"id": "new-model"}]},
+                id="models",
+            ),
+            pytest.param(
+                "agents.defaults.models",
+                {"ollama/model1": {"alias": "short1"}},
+                {"ollama/model2": {"alias": "short2"}},
+                {
+                    "ollama/model1": {"alias": "short1"},
+                    "ollama/model2": {"alias": "short2"},
+                },
+                id="aliases",
+            ),
+            # Lists should be replaced, not merged
+            pytest.param(
+                "agents.defaults.model",
+                {"fallbacks": ["model-a", "model-b"]},
+                {"fallbacks": ["model-c", "model-d"]},
+                {"fallbacks": ["model-c", "model-d"]},
+                id="fallbacks",
+            ),
+        ],
+    )
+    def test_merge_section(self, path, target, source, expected):
+        """Test merging one section of source into target."""
+        target_config, source_config = {}, {}
+        set_nested(target_config, path, target)
+        set_nested(source_config, path, source)
+
+        tgt_val = get_nested(target_config, path)
+        src_val = get_nested(source_config, path)
         result = deep_merge(tgt_val, src_val)
 
-        assert result == {"models": [{"id": "new-model"}]}
+        assert result == expected
 
-    def test_merge_aliases_section(self):
-        """Test merging agents.defaults.models (aliases)."""
-        target = {
-            "agents": {
-                "defaults": {
-                    "models": {
-                        "ollama/model1": {"alias": "short1"}
-                    }
-                }
-            }
-        }
-        source = {
-            "agents": {
-                "defaults": {
-                    "models": {
-                        "ollama/model2": {"alias": "short2"}
-                    }
-                }
-            }
-        }
 
-        tgt_val = get_nested(target, "agents.defaults.models")
-        src_val = get_nested(source, "agents.defaults.models")
-        result = deep_merge(tgt_val, src_val)
+class TestMergeSections:
+    """Tests for merge_sections and merge_ollama_config."""
 
-        assert "ollama/model1" in result
-        assert "ollama/model2" in result
+    SOURCE = {
+        "models": {"providers": {"ollama": {"models": [{"id": "new"}]}}},
+        "agents": {"defaults": {"model": {"primary": "ollama/new"}}},
+    }
 
-    def test_merge_fallbacks_section(self):
-        """Test merging agents.defaults.model.fallbacks."""
-        target = {
-            "agents": {
-                "defaults": {
-                    "model": {
-                        "fallbacks": ["model-a", "model-b"]
-                    }
-                }
-            }
-        }
-        source = {
-            "agents": {
-                "defaults": {
-                    "model": {
-                        "fallbacks": ["model-c", "model-d"]
-                    }
-                }
-            }
-        }
+    def test_statuses(self):
+        """Test that each section reports missing, unchanged or changed."""
+        target = {"agents": {"defaults": {"model": {"primary": "ollama/new"}}}}
+        results = merge_sections(self.SOURCE, target)
 
-        tgt_val = get_nested(target, "agents.defaults.model")
-        src_val = get_nested(source, "agents.defaults.model")
-        result = deep_merge(tgt_val, src_val)
+        assert results == [
+            ("models.providers.ollama", merge_config.CHANGED),
+            ("agents.defaults.model", merge_config.UNCHANGED),
+            ("agents.defaults.models", merge_config.MISSING),
+        ]
+        assert target["models"]["providers"]["ollama"] == {"models": [{"id": "new"}]}
+
+    def test_apply_false_leaves_target(self):
+        """Test that apply=False only reports changes."""
+        target = {"gateway": {"port": 1}}
+        results = merge_sections(self.SOURCE, target, apply=False)
+
+        assert ("models.providers.ollama", merge_config.CHANGED) in results
+        assert target == {"gateway": {"port": 1}}
 
-        # Lists should be replaced, not merged
-        assert result["fallbacks"] == ["model-c", "model-d"]
+    def test_merge_ollama_config_bytes(self):
+        """Test merging JSON bytes in-process keeps unrelated settings."""
+        target_json = json.dumps({"gateway": {"port": 1}}).encode()
+        merged = json.loads(merge_ollama_config(json.dumps(self.SOURCE).encode(), target_json))
+
+        assert merged["gateway"] == {"port": 1}
+        assert merged["models"] == self.SOURCE["models"]
+        assert merged["agents"] == self.SOURCE["agents"]
 
 
 class TestBackupCreation:
@@ -289,54 +413,108 @@ class TestBackupCreation:
         target_file = tmp_path / "openclaw.json"
         target_file.write_text('{"test": true}')
 
-        backup_file = target_file.with_suffix(".json.bak")
-
-        shutil.copy2(target_file, backup_file)
+        backup_file = create_backup(target_file)
 
-        assert backup_file.exists()
+        assert backup_file == target_file.with_suffix(".json.bak")
         assert backup_file.read_text() == '{"test": true}'
 
-    def test_backup_preserves_metadata(self, tmp_path):
-        """Test that backup preserves file metadata."""
+    def test_backup_preserves_permissions(self, tmp_path):
+        """Test that backup keeps the original's permission bits."""
         target_file = tmp_path / "openclaw.json"
         target_file.write_text('{"test": true}')
+        os.chmod(target_file, 0o600)
 
-        import time
-        time.sleep(0.1)  # Ensure mtime differs
+        backup_file = create_backup(target_file)
 
-        backup_file = target_file.with_suffix(".json.bak")
-        shutil.copy2(target_file, backup_file)
+        assert (backup_file.stat().st_mode & 0o777) == 0o600
 
-        # Check that the file was copied (metadata preserved)
-        assert backup_file.exists()
+    def test_backup_overwrites_previous(self, tmp_path):
+        """Test that an existing backup is replaced."""
+        target_file = tmp_path / "openclaw.json"
+        target_file.write_text('{"test": true}')
+        target_file.with_suffix(".json.bak").write_text("stale")
 
+        assert create_backup(target_file).read_text() == '{"test": true}'
 
-class TestDryRunMode:
-    """Tests for dry-run mode."""
 
-    def test_dry_run_does_not_modify_files(self, tmp_path):
-        """Test that dry-run doesn't modify the target file."""
-        source_file = tmp_path / "source.json"
-        source_file.write_text('{"value": "new"}')
+class TestAtomicWrite:
+    """Tests for write_atomic."""
 
-        target_file = tmp_path / "target.json"
-        target_file.write_text('{"value": "old"}')
+    def test_replaces_file_and_cleans_up(self, tmp_path):
+        """Test that the target is replaced and no temp file is left."""
+        target_file = tmp_path / "openclaw.json"
+        target_file.write_text('{"old": true}')
+        os.chmod(target_file, 0o600)
 
-        original_content = target_file.read_text()
+        write_atomic(target_file, b'{"new": true}\n')
 
-        # Simulate dry-run (import and check logic)
-        with open(source_file) as f:
-            source = json.load(f)
-        with open(target_file) as f:
-            target = json.load(f)
+        assert target_file.read_bytes() == b'{"new": true}\n'
+        assert (target_file.stat().st_mode & 0o777) == 0o600
+        assert list(tmp_path.iterdir()) == [target_file]
+
+    def test_temp_file_created_with_original_mode(self, tmp_path):
+        """Test that the temp file never has wider permissions than the original."""
+        target_file = tmp_path / "openclaw.json"
+        target_file.write_text('{"old": true}')
+        os.chmod(target_file, 0o600)
+
+        with patch.object(merge_config.os, "open", wraps=os.open) as spy:
+            write_atomic(target_file, b'{"new": true}\n')
+
+        assert spy.call_args.args[2] == 0o600
+
+    def test_symlink_target_is_replaced(self, tmp_path):
+        """Test that a symlinked target keeps its link and updates the real file."""
+        real_file = tmp_path / "dotfiles" / "openclaw.json"
+        real_file.parent.mkdir()
+        real_file.write_text('{"old": true}')
+        link = tmp_path / "openclaw.json"
+        link.symlink_to(real_file)
+
+        write_atomic(link, b'{"new": true}\n')
+
+        assert link.is_symlink()
+        assert real_file.read_bytes() == b'{"new": true}\n'
+
+    def test_failed_write_keeps_original(self, tmp_path):
+        """Test that an interrupted write leaves the original untouched."""
+        target_file = tmp_path / "openclaw.json"
+        target_file.write_text('{"old": true}')
+
+        with patch.object(merge_config.os, "replace", side_effect=OSError("boom")):
+            with pytest.raises(OSError):
+                write_atomic(target_file, b'{"new": true}')
+
+        assert target_file.read_text() == '{"old": true}'
+        assert list(tmp_path.iterdir()) == [target_file]
+
+
+class TestDryRunMode:
+    """Tests for dry-run mode."""
+
+    def test_dry_run_does_not_modify_files(self):
+        """Test that dry-run doesn't modify the target config."""
+        source = json.loads('{"value": "new"}')
+        target = json.loads('{"value": "old"}')
 
         # In dry-run mode, we compare but don't write
         src_val = get_nested(source, "value")
         tgt_val = get_nested(target, "value")
 
         # Target should NOT be modified
-        assert target_file.read_text() == original_content
+        assert target == {"value": "old"}
         assert tgt_val == "old"
+        assert src_val == "new"
+
+    def test_dry_run_merge_sections_does_not_modify(self):
+        """Test that merge_sections with apply=False reports but doesn't write."""
+        source = {"agents": {"defaults": {"model": {"primary": "new"}}}}
+        target = {"agents": {"defaults": {"model": {"primary": "old"}}}}
+
+        results = merge_sections(source, target, select_sections(only_agents=True), apply=False)
+
+        assert ("agents.defaults.model", merge_config.CHANGED) in results
+        assert target == {"agents": {"defaults": {"model": {"primary": "old"}}}}
 
     def test_dry_run_detects_changes(self, tmp_path):
         """Test that dry-run correctly identifies changes."""
@@ -353,50 +531,78 @@ class TestDryRunMode:
 class TestOnlyFlags:
     """Tests for --only-models and --only-agents flags."""
 
-    def test_only_models_flag(self):
-        """Test that only_models selects correct sections."""
-        only_models = True
-        only_agents = False
-
-        if only_models:
-            sections_to_merge = [("models.providers.ollama", "models.providers.ollama")]
-        elif only_agents:
-            sections_to_merge = [
-                ("agents.defaults.model", "agents.defaults.model"),
-                ("agents.defaults.models", "agents.defaults.models"),
-            ]
-        else:
-            sections_to_merge = [
-                ("models.providers.ollama", "models.providers.ollama"),
-                ("agents.defaults.model", "agents.defaults.model"),
-                ("agents.defaults.models", "agents.defaults.models"),
-            ]
-
-        assert len(sections_to_merge) == 1
-        assert sections_to_merge[0] == ("models.providers.ollama", "models.providers.ollama")
-
-    def test_only_agents_flag(self):
-        """Test that only_agents selects correct sections."""
-        only_models = False
-        only_agents = True
-
-        if only_models:
-            sections_to_merge = [("models.providers.ollama", "models.providers.ollama")]
-        elif only_agents:
-            sections_to_merge = [
-                ("agents.defaults.model", "agents.defaults.model"),
-                ("agents.defaults.models", "agents.defaults.models"),
-            ]
-        else:
-            sections_to_merge = [
-                ("models.providers.ollama", "models.providers.ollama"),
-                ("agents.defaults.model", "agents.defaults.model"),
-                ("agents.defaults.models", "agents.defaults.models"),
-            ]
-
-        assert len(sections_to_merge) == 2
-        assert ("agents.defaults.model", "agents.defaults.model") in sections_to_merge
-        assert ("agents.defaults.models", "agents.defaults.models") in sections_to_merge
+    @pytest.mark.parametrize("only_models, only_agents, expected", [
+        (True, False, merge_config.SECTIONS_ONLY_MODELS),
+        (False, True, merge_config.SECTIONS_ONLY_AGENTS),
+        (False, False, merge_config.SECTIONS_ALL),
+    ], ids=["only-models", "only-agents", "all"])
+    def test_select_sections(self, only_models, only_agents, expected):
+        """Test that the --only-* flags select the matching section table."""
+        assert select_sections(only_models, only_agents) is expected
+
+    def test_section_tables(self):
+        """Test the paths covered by each section table."""
+        def paths(sections):
+            return [path for path, _ in sections]
+
+        assert paths(merge_config.SECTIONS_ONLY_MODELS) == ["models.providers.ollama"]
+        assert paths(merge_config.SECTIONS_ONLY_AGENTS) == ["agents.defaults.model", "agents.defaults.models"]
+        assert paths(merge_config.SECTIONS_ALL) == paths(merge_config.SECTIONS_ONLY_MODELS) + paths(merge_config.SECTIONS_ONLY_AGENTS)
+        for path, keys in merge_config.SECTIONS_ALL:
+            assert keys == tuple(path.split("."))
+
+    def test_common_prefix_per_mode(self):
+        """Test the key prefix each merge mode needs from the source."""
+        assert merge_config._common_prefix(merge_config.SECTIONS_ONLY_MODELS) == ("models", "providers", "ollama")
+        assert merge_config._common_prefix(merge_config.SECTIONS_ONLY_AGENTS) == ("agents", "defaults")
+        assert merge_config._common_prefix(merge_config.SECTIONS_ALL) == ()
+
+    def test_only_models_never_materializes_agents(self):
+        """Test that --only-models streams just the models subtree."""
+        pytest.importorskip("ijson")
+        full = load_json(CLOUD_CONFIG)
+
+        source = load_source(CLOUD_CONFIG, merge_config.SECTIONS_ONLY_MODELS)
+
+        assert list(source) == ["models"]
+        assert source["models"]["providers"] == {"ollama": full["models"]["providers"]["ollama"]}
+
+    def test_only_agents_never_materializes_models(self):
+        """Test that --only-agents streams just the agent defaults."""
+        pytest.importorskip("ijson")
+        full = load_json(CLOUD_CONFIG)
+
+        source = load_source(CLOUD_CONFIG, merge_config.SECTIONS_ONLY_AGENTS)
+
+        assert source == {"agents": {"defaults": full["agents"]["defaults"]}}
+
+    def test_only_models_rejects_truncated_source(self, tmp_path):
+        """Test that a streamed partial load still parses to the end of the file."""
+        ijson = pytest.importorskip("ijson")
+        truncated = tmp_path / "cloud.json"
+        truncated.write_bytes(CLOUD_CONFIG.read_bytes()[:-40])
+
+        with pytest.raises(ijson.JSONError):
+            load_source(truncated, merge_config.SECTIONS_ONLY_MODELS)
+
+    def test_only_models_duplicate_key_keeps_last(self, tmp_path):
+        """Test that duplicate keys resolve like a full parse (last one wins)."""
+        pytest.importorskip("ijson")
+        source_file = tmp_path / "cloud.json"
+        source_file.write_text(
+            '{"models": {"providers": {"ollama": {"v": 1}}},'
+            ' "models": {"providers": {"ollama": {"v": 2}}}}'
+        )
+
+        source = load_source(source_file, merge_config.SECTIONS_ONLY_MODELS)
+
+        assert source == load_json(source_file)
+
+    def test_load_source_without_ijson(self):
+        """Test that partial loads fall back to a full parse."""
+        with patch.object(merge_config, "ijson", None):
+            source = load_source(CLOUD_CONFIG, merge_config.SECTIONS_ONLY_MODELS)
+        assert source == load_json(CLOUD_CONFIG)
 
 
 class TestIntegration:
@@ -424,7 +630,7 @@ class TestIntegration:
                 }
             }
         }
-        source_file.write_text(json.dumps(source_config))
+        source_file.write_text(json.dumps(source_config, separators=(",", ":"), ensure_ascii=False))
 
         # Create target config
         target_file = tmp_path / "target.json"
@@ -443,7 +649,7 @@ class TestIntegration:
                 }
             }
         }
-        target_file.write_text(json.dumps(target_config))
+        target_file.write_text(json.dumps(target_config, separators=(",", ":"), ensure_ascii=False))
 
         # Load configs
         with open(source_file) as f:
@@ -451,27 +657,28 @@ class TestIntegration:
         with open(target_file) as f:
             target = json.load(f)
 
+        # source is not reused after the merge, so subtrees are assigned without copying
         # Merge models.providers.ollama
         src_val = get_nested(source, "models.providers.ollama")
-        set_nested(target, "models.providers.ollama", json.loads(json.dumps(src_val)))
+        set_nested(target, "models.providers.ollama", src_val)
 
         # Merge agents.defaults.model
         src_val = get_nested(source, "agents.defaults.model")
-        set_nested(target, "agents.defaults.model", json.loads(json.dumps(src_val)))
+        set_nested(target, "agents.defaults.model", src_val)
 
         # Merge agents.defaults.models
         src_val = get_nested(source, "agents.defaults.models")
-        set_nested(target, "agents.defaults.models", json.loads(json.dumps(src_val)))
-
-        # Verify merge
-        merged_models = get_nested(target, "models.providers.ollama.models")
+        set_nested(target, "agents.defaults.models", src_val)
+
+        # Verify merge; the agents.defaults paths share their prefix walk
+        merged_models, merged_primary, merged_aliases = get_nested_multi(target, (
+            "models.providers.ollama.models",
+            "agents.defaults.model.primary",
+            "agents.defaults.models",
+        ))
         assert len(merged_models) == 2
         assert merged_models[0]["id"] == "model-1"
-
-        merged_primary = get_nested(target, "agents.defaults.model.primary")
         assert merged_primary == "model-1"
-
-        merged_aliases = get_nested(target, "agents.defaults.models")
         assert "ollama/model-1" in merged_aliases
 
 
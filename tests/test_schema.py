@@ -5,25 +5,69 @@ Schema validation tests for openclaw-ollama-cloud.json
 Validates that the cloud config follows OpenClaw's expected structure.
 """
 
-import json
 import re
-from pathlib import Path
+from collections import namedtuple
 
 import pytest
 
-REPO_DIR = Path(__file__).parent.parent
-CLOUD_CONFIG = REPO_DIR / "openclaw-ollama-cloud.json"
+# "<name>:<variant>", e.g. "minimax-m2.5:cloud"
+_MODEL_ID_RE = re.compile(r"[A-Za-z0-9._-]+:[A-Za-z0-9._-]+")
+
+# Non-empty string fields every model must have
+_REQUIRED_FIELDS = ("id", "name")
+
+# Optional model fields and the type each must have when present
+_OPTIONAL_FIELDS = {
+    "reasoning": bool,
+    "input": list,
+    "cost": dict,
+    "contextWindow": int,
+    "maxTokens": int,
+}
+_COST_FIELDS = ("input", "output", "cacheRead", "cacheWrite")
+_NUMBER = (int, float)
+
+
+@pytest.fixture(scope="session")
+def config(source_config_dict):
+    """The cloud config, parsed once per session; tests must not mutate it."""
+    return source_config_dict
+
+
+def _assert_path_exists(obj, path):
+    """Assert that a dot path exists; numeric parts index into lists."""
+    for key in path.split("."):
+        if isinstance(obj, list):
+            assert key.isdigit() and int(key) < len(obj), f"Missing '{path}' at '{key}'"
+            obj = obj[int(key)]
+        else:
+            assert isinstance(obj, dict) and key in obj, f"Missing '{path}' at '{key}'"
+            obj = obj[key]
+
+
+@pytest.fixture(scope="session")
+def ollama_models(config):
+    """The ollama provider's model list."""
+    return config["models"]["providers"]["ollama"]["models"]
+
+
+Parsed = namedtuple("Parsed", "config models model_id_set alias_map")
+
+
+@pytest.fixture(scope="session")
+def parsed(config, ollama_models):
+    """Model list, model ID set and alias map, derived from the config once."""
+    return Parsed(
+        config=config,
+        models=ollama_models,
+        model_id_set=frozenset(m["id"] for m in ollama_models),
+        alias_map=config["agents"]["defaults"].get("models", {}),
+    )
 
 
 class TestSchemaValidation:
     """Validate the cloud config JSON schema."""
 
-    @pytest.fixture
-    def config(self):
-        """Load the cloud config."""
-        with open(CLOUD_CONFIG) as f:
-            return json.load(f)
-
     def test_config_is_valid_json(self, config):
         """Test that config is valid JSON."""
         assert config is not None
@@ -58,69 +102,49 @@ class TestSchemaValidation:
         # baseUrl should be a valid URL
         assert ollama["baseUrl"].startswith("http://") or ollama["baseUrl"].startswith("https://")
 
-    def test_models_is_non_empty_list(self, config):
+    def test_models_is_non_empty_list(self, ollama_models):
         """Test that models list is non-empty."""
-        models = config["models"]["providers"]["ollama"]["models"]
-        assert len(models) > 0, "Must have at least one model"
+        assert len(ollama_models) > 0, "Must have at least one model"
 
-    def test_each_model_has_required_fields(self, config):
+    def test_each_model_has_required_fields(self, ollama_models):
         """Test that each model has required fields."""
-        models = config["models"]["providers"]["ollama"]["models"]
-        
-        required_fields = ["id", "name"]
-        
-        for i, model in enumerate(models):
-            for field in required_fields:
-                assert field in model, f"Model {i} missing required field '{field}'"
-                assert isinstance(model[field], str), f"Model {i} field '{field}' must be string"
-                assert len(model[field]) > 0, f"Model {i} field '{field}' must not be empty"
-
-    def test_each_model_has_optional_fields(self, config):
+        bad = [
+            (i, field)
+            for i, model in enumerate(ollama_models)
+            for field in _REQUIRED_FIELDS
+            if not isinstance(model.get(field), str) or not model[field]
+        ]
+        assert not bad, f"(model index, field) missing, not a string or empty: {bad}"
+
+    def test_each_model_has_optional_fields(self, ollama_models):
         """Test that each model has optional fields with correct types."""
-        models = config["models"]["providers"]["ollama"]["models"]
-        
-        optional_fields = {
-            "reasoning": bool,
-            "input": list,
-            "cost": dict,
-            "contextWindow": int,
-            "maxTokens": int,
-        }
-        
-        for i, model in enumerate(models):
-            for field, expected_type in optional_fields.items():
+        for i, model in enumerate(ollama_models):
+            for field, expected_type in _OPTIONAL_FIELDS.items():
                 if field in model:
                     assert isinstance(model[field], expected_type), \
                         f"Model {i} field '{field}' must be {expected_type.__name__}"
 
-    def test_model_id_format(self, config):
+    def test_model_id_format(self, ollama_models):
         """Test that model IDs follow naming convention."""
-        models = config["models"]["providers"]["ollama"]["models"]
-        
-        for i, model in enumerate(models):
+        for i, model in enumerate(ollama_models):
             model_id = model["id"]
-            # Should contain ':' for variant (e.g., "minimax-m2.5:cloud")
-            assert ":" in model_id, f"Model {i} id '{model_id}' should contain ':' for variant"
-            
-            # ID should not be empty
-            assert len(model_id) > 0
+            # Exactly one ':' separating name and variant (e.g., "minimax-m2.5:cloud")
+            assert _MODEL_ID_RE.fullmatch(model_id) is not None, \
+                f"Model {i} id '{model_id}' should be '<name>:<variant>'"
 
-    def test_cost_structure(self, config):
+    def test_cost_structure(self, ollama_models):
         """Test that cost objects have valid structure."""
-        models = config["models"]["providers"]["ollama"]["models"]
+        costs = [(i, model["cost"]) for i, model in enumerate(ollama_models) if "cost" in model]
+        not_dict = [i for i, cost in costs if not isinstance(cost, dict)]
+        assert not not_dict, f"Model cost must be dict: {not_dict}"
         
-        cost_fields = ["input", "output", "cacheRead", "cacheWrite"]
-        
-        for i, model in enumerate(models):
-            if "cost" in model:
-                cost = model["cost"]
-                assert isinstance(cost, dict), f"Model {i} cost must be dict"
-                
-                for field in cost_fields:
-                    assert field in cost, f"Model {i} cost missing '{field}'"
-                    assert isinstance(cost[field], (int, float)), \
-                        f"Model {i} cost '{field}' must be number"
-                    assert cost[field] >= 0, f"Model {i} cost '{field}' must be non-negative"
+        bad = [
+            (i, field)
+            for i, cost in costs
+            for field in _COST_FIELDS
+            if not isinstance(cost.get(field), _NUMBER) or cost[field] < 0
+        ]
+        assert not bad, f"(model index, cost field) missing, not a number or negative: {bad}"
 
     def test_has_agents_section(self, config):
         """Test that config has agents section."""
@@ -142,58 +166,44 @@ class TestSchemaValidation:
         assert isinstance(model_config["primary"], str)
         assert len(model_config["primary"]) > 0
 
-    def test_primary_model_references_valid_model(self, config):
-        """Test that primary model references an actual model in the list."""
-        primary = config["agents"]["defaults"]["model"]["primary"]
-        models = config["models"]["providers"]["ollama"]["models"]
-        model_ids = [m["id"] for m in models]
-        
-        # Primary format: "ollama/minimax-m2.5:cloud" -> extract just the id
-        primary_id = primary.replace("ollama/", "")
-        
-        assert primary_id in model_ids, \
-            f"Primary model '{primary_id}' not found in models list"
-
-    def test_fallbacks_are_valid_model_references(self, config):
-        """Test that fallback models reference actual models."""
-        fallbacks = config["agents"]["defaults"]["model"].get("fallbacks", [])
-        models = config["models"]["providers"]["ollama"]["models"]
-        model_ids = [m["id"] for m in models]
-        
-        for fallback in fallbacks:
-            # Fallback format: "ollama/minimax-m2.5:cloud" -> extract just the id
-            fallback_id = fallback.replace("ollama/", "")
-            assert fallback_id in model_ids, \
-                f"Fallback model '{fallback_id}' not found in models list"
-
-    def test_model_aliases_are_valid(self, config):
+    @pytest.mark.parametrize(
+        "label, getter",
+        [
+            pytest.param(
+                "primary",
+                lambda c: [c["agents"]["defaults"]["model"]["primary"]],
+                id="primary",
+            ),
+            pytest.param(
+                "fallbacks",
+                lambda c: c["agents"]["defaults"]["model"].get("fallbacks", []),
+                id="fallbacks",
+            ),
+            pytest.param(
+                "aliases",
+                lambda c: list(c["agents"]["defaults"].get("models", {})),
+                id="aliases",
+            ),
+        ],
+    )
+    def test_model_references_are_valid(self, parsed, label, getter):
+        """Test that primary, fallback and alias references name actual models."""
+        # Reference format: "ollama/minimax-m2.5:cloud" -> extract just the id
+        refs = {ref.removeprefix("ollama/") for ref in getter(parsed.config)}
+        missing = refs - parsed.model_id_set
+        assert not missing, f"Unknown {label} models: {sorted(missing)}"
+
+    def test_model_aliases_are_valid(self, parsed):
         """Test that model aliases are properly formatted."""
-        defaults = config["agents"]["defaults"]
-        
-        if "models" in defaults:
-            aliases = defaults["models"]
-            models = config["models"]["providers"]["ollama"]["models"]
-            model_ids = [m["id"] for m in models]
-            
-            for model_ref, alias_config in aliases.items():
-                # Model reference format: "ollama/minimax-m2.5:cloud" -> extract id
-                model_id = model_ref.replace("ollama/", "")
-                
-                # Model reference must exist
-                assert model_id in model_ids, \
-                    f"Alias references unknown model '{model_id}'"
-                
-                # Alias must have required fields
-                assert "alias" in alias_config, f"Alias config for {model_ref} missing 'alias'"
-                assert isinstance(alias_config["alias"], str)
-                assert len(alias_config["alias"]) > 0
-
-    def test_no_duplicate_model_ids(self, config):
+        for model_ref, alias_config in parsed.alias_map.items():
+            # Alias must have required fields
+            assert "alias" in alias_config, f"Alias config for {model_ref} missing 'alias'"
+            assert isinstance(alias_config["alias"], str)
+            assert len(alias_config["alias"]) > 0
+
+    def test_no_duplicate_model_ids(self, parsed):
         """Test that model IDs are unique."""
-        models = config["models"]["providers"]["ollama"]["models"]
-        ids = [m["id"] for m in models]
-        
-        assert len(ids) == len(set(ids)), "Model IDs must be unique"
+        assert len(parsed.models) == len(parsed.model_id_set), "Model IDs must be unique"
 
     def test_no_duplicate_aliases(self, config):
         """Test that aliases are unique."""
@@ -209,41 +219,37 @@ class TestSchemaValidation:
 class TestInvalidSchema:
     """Test that invalid schemas are rejected."""
 
-    def test_empty_config_rejected(self):
-        """Test that empty config is rejected."""
-        config = {}
-        
-        with pytest.raises(AssertionError):
-            assert "models" in config
-
-    def test_missing_models_rejected(self):
-        """Test that config without models is rejected."""
-        config = {"agents": {"defaults": {"model": {"primary": "test"}}}}
-        
-        with pytest.raises(AssertionError):
-            assert "models" in config
-
-    def test_missing_primary_model_rejected(self):
-        """Test that config without primary model is rejected."""
-        config = {
-            "models": {"providers": {"ollama": {"models": []}}},
-            "agents": {"defaults": {"model": {}}}
-        }
-        
-        with pytest.raises(AssertionError):
-            assert "primary" in config["agents"]["defaults"]["model"]
-
-    def test_invalid_model_structure_rejected(self):
-        """Test that model without id is rejected."""
-        config = {
-            "models": {"providers": {"ollama": {"models": [{"name": "test"}]}}},
-            "agents": {"defaults": {"model": {"primary": "ollama/test"}}}
-        }
-        
+    @pytest.mark.parametrize(
+        "bad_config, missing_key_path",
+        [
+            pytest.param({}, "models", id="empty_config"),
+            pytest.param(
+                {"agents": {"defaults": {"model": {"primary": "test"}}}},
+                "models",
+                id="missing_models",
+            ),
+            pytest.param(
+                {
+                    "models": {"providers": {"ollama": {"models": []}}},
+                    "agents": {"defaults": {"model": {}}},
+                },
+                "agents.defaults.model.primary",
+                id="missing_primary_model",
+            ),
+            pytest.param(
+                {
+                    "models": {"providers": {"ollama": {"models": [{"name": "test"}]}}},
+                    "agents": {"defaults": {"model": {"primary": "ollama/test"}}},
+                },
+                "models.providers.ollama.models.0.id",
+                id="model_without_id",
+            ),
+        ],
+    )
+    def test_rejected(self, bad_config, missing_key_path):
+        """Test that a config missing a required key is rejected."""
         with pytest.raises(AssertionError):
-            # Check each model has required fields
-            for model in config["models"]["providers"]["ollama"]["models"]:
-                assert "id" in model
+            _assert_path_exists(bad_config, missing_key_path)
 
 
 if __name__ == "__main__":